@@ -4,205 +4,820 @@ Flask Backend for Murf AI Voice Agent
 Provides REST API and WebSocket support for the React frontend
 """
 
+# Monkey-patch the stdlib before anything else imports socket/ssl so that
+# Gemini and Murf HTTP round-trips yield to other greenlets
+from gevent import monkey
+monkey.patch_all()
+
+from gevent.threadpool import ThreadPool
+
+import logging
 import os
-import asyncio
-import json
+import re
+import hashlib
+import random
+import shelve
+import sys
+import threading
+import time
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, request, jsonify, send_file
+from functools import cached_property, lru_cache
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 from dotenv import load_dotenv
-import requests
-import google.genai as genai
-from deepgram import DeepgramClient
+import atexit
+import httpx
+import orjson
 
 # Load environment variables
 load_dotenv()
 
+class NativeQueueListener(QueueListener):
+    """QueueListener whose worker is a native OS thread, so terminal writes never block the hub"""
+
+    def start(self):
+        # gevent locks can't be shared with a native thread; use the unpatched primitives
+        for handler in self.handlers:
+            handler.lock = monkey.get_original('_thread', 'RLock')()
+        self._stopped = monkey.get_original('_thread', 'allocate_lock')()
+        self._stopped.acquire()
+        monkey.get_original('_thread', 'start_new_thread')(self._run, ())
+
+    def _run(self):
+        try:
+            self._monitor()
+        finally:
+            self._stopped.release()
+
+    def stop(self):
+        self.enqueue_sentinel()
+        self._stopped.acquire(timeout=5)
+
+# Log through an unpatched queue so request handlers never block on the terminal write
+log = logging.getLogger('voice_agent')
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_queue = monkey.get_original('queue', 'SimpleQueue')()
+log.addHandler(QueueHandler(_log_queue))
+_log_listener = NativeQueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the bytes -> str -> bytes round-trip of dumps()
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
+class OrjsonSocketIOJSON:
+    """orjson with the json-module interface Flask-SocketIO expects"""
+
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+# Bounded fan-out for multi-text TTS (/api/tts lists and batch conversations)
+MAX_TTS_BATCH = 100
+tts_batch_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='murf-batch')
+
+# Native threads for pure-Python CPU work (> ~1ms), such as batch prompt building: the
+# GIL is released every switch interval so greenlets keep running. C calls that hold
+# the GIL (orjson) gain nothing here and should just run inline
+cpu_pool = ThreadPool(4)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, async_mode='gevent', cors_allowed_origins="*", json=OrjsonSocketIOJSON)
 
 # Global variables
-conversations = {}  # Store conversation history per session
+MAX_SESSIONS = 10_000  # Least recently used sessions are evicted past this
+HISTORY_TURNS = 12  # Messages kept per session (the prompt only reads the last 6)
+HISTORY_TTL = 86400  # Seconds an idle session's history is kept in Redis
+conversations: "OrderedDict[str, SessionHistory]" = OrderedDict()  # Store conversation history per session
 gemini_model = None
 
+# System prompt for the AI assistant (invariant across turns)
+SYSTEM_PROMPT = """You are Neha, a helpful and friendly AI voice assistant living in India for a hackathon project.
+        You should:
+        - Be warm, conversational, and culturally aware of Indian context.
+        - Use Indian English expressions and be familiar with Indian culture, festivals, and daily life.
+        - Be enthusiastic about Indian tech innovation, startups, and cultural diversity.
+        - If asked to tell a story or be creative, you should provide a longer, more detailed response.
+        - For normal questions, keep responses reasonably concise for a voice interface.
+        - Show a friendly, approachable personality with Indian warmth.
+        - Remember context from the conversation to avoid repetition.
+        - Be enthusiastic about helping users with their Indian lifestyle and tech needs.
+
+        You live in India and understand Indian culture, so you can reference Indian festivals, food, cities, and daily life naturally.
+        This is for a voice interface, so responses should sound natural when spoken in an Indian accent."""
+ROLE_PREFIXES = {'user': "User: ", 'model': "Assistant: "}
+# Sent as system_instruction so the persona isn't re-inlined into every prompt
+GEMINI_CONFIG = {'system_instruction': SYSTEM_PROMPT}
+GEMINI_MODEL = "gemini-2.0-flash"
+# Cached replies are only valid for the model and persona that produced them
+GEMINI_CACHE_SCOPE = (GEMINI_MODEL, hashlib.blake2b(SYSTEM_PROMPT.encode(), digest_size=8).hexdigest())
+
+# Sentence boundary used to chunk streamed Gemini output for Murf
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+# A trailing "1." split off a numbered list; spoken with the sentence after it, not as its own clip
+LIST_MARKER_RE = re.compile(r'(?:^|\n)[ \t]*(\d{1,3}[.)])$')
+MIN_REPLY_CHARS = 5  # Shorter Gemini replies ("Ok", ".") get the fallback instead
+# Trailing sentence punctuation that doesn't change what the user asked, for response cache keys
+UTTERANCE_END_RE = re.compile(r'[?!.\s]+$')
+
+def _split_sentences(text: str) -> list:
+    """Split a finished reply into the sentences it is spoken as, keeping list markers attached"""
+    sentences = []
+    marker = ""
+    for sentence in SENTENCE_END_RE.split(text):
+        sentence = sentence.strip()
+        found = LIST_MARKER_RE.search(sentence)
+        next_marker = ""
+        if found:
+            sentence, next_marker = sentence[:found.start()].strip(), found.group(1)
+        if sentence:
+            sentences.append(f"{marker} {sentence}" if marker else sentence)
+            marker = ""
+        if next_marker:
+            marker = next_marker
+    return sentences
+
+MURF_API_URL = 'https://api.murf.ai/v1/speech/generate'
+MURF_VOICE_ID = 'en-US-samantha'
+MURF_FORMAT = 'mp3'
+MURF_SAMPLE_RATE = 24000
+AUDIO_CHUNK_SIZE = 8192  # Bytes per chunk when proxying Murf audio to the client
+
+# Murf results for the static replies survive restarts in this shelve file
+TTS_WARM_CACHE_PATH = os.getenv(
+    'TTS_WARM_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.tts_warm_cache')
+)
+
+# Static fallback replies (constant output, so pre-synthesized at startup)
+GREETING_REPLY = "Namaste! I'm Neha, your AI voice assistant in India. How can I help you today?"
+HOW_ARE_YOU_REPLY = "I'm doing great, thank you! It's wonderful to connect with you from India. What's on your mind?"
+NAME_REPLY = "I'm Neha, your friendly AI voice assistant built for the Techfest IIT Bombay hackathon using Murf Falcon TTS!"
+HELP_REPLY = "I can have natural conversations with you! I understand Indian culture and use Google's Gemini AI for smart responses with Murf Falcon voice synthesis."
+THANKS_REPLY = "You're most welcome! Dhanyavaad! I'm here whenever you need to chat."
+BYE_REPLY = "Goodbye! It was wonderful talking with you. Dhanyavaad and take care!"
+REPEAT_REPLY = "I see you're asking the same question. Let me try a different approach - could you tell me more about what you're looking for?"
+LONG_INPUT_REPLY = "That sounds interesting! You have a lot to say about that topic. Tell me more!"
+STATIC_REPLIES = (
+    GREETING_REPLY, HOW_ARE_YOU_REPLY, NAME_REPLY, HELP_REPLY,
+    THANKS_REPLY, BYE_REPLY, REPEAT_REPLY, LONG_INPUT_REPLY
+)
+
+# Keyword intents in priority order; the first matching intent wins
+INTENTS = (
+    (frozenset({"hello", "hi", "hey"}), GREETING_REPLY),
+    (frozenset({"how are you"}), HOW_ARE_YOU_REPLY),
+    (frozenset({"name", "who are you"}), NAME_REPLY),
+    (frozenset({"help", "what can you do"}), HELP_REPLY),
+    (frozenset({"thank", "thanks"}), THANKS_REPLY),
+    (frozenset({"bye", "goodbye", "see you"}), BYE_REPLY),
+)
+INTENT_REPLIES = {
+    phrase: (priority, reply)
+    for priority, (phrases, reply) in enumerate(INTENTS)
+    for phrase in phrases
+}
+INTENT_RE = re.compile(
+    r'\b(' + '|'.join(sorted(map(re.escape, INTENT_REPLIES), key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+@lru_cache(maxsize=1024)
+def _match_intent(user_input: str):
+    """Return the highest-priority intent reply for the input, or None (memoized per input)"""
+    matches = {m.group(1).lower() for m in INTENT_RE.finditer(user_input)}
+    if matches:
+        return min(INTENT_REPLIES[phrase] for phrase in matches)[1]
+    return None
+
+# Fun, engaging default responses ({0} is the user's input)
+QUESTION_TEMPLATE = "That's a great question about '{0}'. While I'm still learning, I'd love to hear your thoughts on it!"
+DEFAULT_TEMPLATES = (
+    "I heard you say '{0}'. That's fascinating! What made you think about that?",
+    "'{0}' - I love hearing about that! Can you tell me more?",
+    "Thanks for sharing that with me! '{0}' sounds really interesting.",
+    "I appreciate you telling me about '{0}'. What's your favorite part?",
+    "That's really cool! '{0}' got me thinking. What's next on your mind?"
+)
+
+# Gemini Batch API for bulk, non-realtime workloads (about half the per-call price)
+GEMINI_BATCH_ENABLED = os.getenv('GEMINI_BATCH_ENABLED', '').lower() in ('1', 'true', 'yes')
+GEMINI_BATCH_TIMEOUT = float(os.getenv('GEMINI_BATCH_TIMEOUT', '600'))
+BATCH_DONE_STATES = frozenset({
+    'JOB_STATE_SUCCEEDED', 'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'
+})
+
+# Client-side request budgets (Gemini free tier allows 60 requests per minute)
+GEMINI_RPM = int(os.getenv('GEMINI_RPM', '55'))
+MURF_RPM = int(os.getenv('MURF_RPM', '300'))
+RATE_LIMIT_MAX_WAIT = 10.0  # Seconds a call may queue before it is short-circuited
+
+# Optional shared cache tier for multi-worker deployments
+REDIS_URL = os.getenv('REDIS_URL')
+_redis_client = None
+if REDIS_URL:
+    # Only import the client when a shared tier is configured
+    try:
+        import redis
+        _redis_client = redis.Redis(connection_pool=redis.ConnectionPool.from_url(REDIS_URL))
+    except ImportError:  # Redis is optional; the in-process cache still works
+        log.warning("REDIS_URL is set but the redis package is not installed")
+    except Exception as e:
+        log.error("Redis initialization failed: %s", e)
+
+# Shared HTTP/2 client so concurrent Murf calls multiplex over warm connections
+MURF_TIMEOUT = httpx.Timeout(27.0, connect=3.0)
+MURF_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+MURF_RETRY_STATUSES = frozenset({502, 503, 504})
+MURF_MAX_RETRIES = 2
+MURF_RETRY_DELAY = 0.2  # Base backoff in seconds, doubled per attempt plus jitter
+_murf_http = httpx.Client(
+    timeout=MURF_TIMEOUT,
+    transport=httpx.HTTPTransport(http2=True, limits=MURF_LIMITS, retries=MURF_MAX_RETRIES)
+)
+atexit.register(_murf_http.close)
+
+class ResponseCache:
+    """Two-tier cache: in-process LRU in front of an optional shared Redis"""
+
+    def __init__(self, namespace: str, maxsize: int = 1024, ttl: int = 86400):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._local = OrderedDict()
+        self._redis = _redis_client
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Hash the cache inputs into a short fixed-size key"""
+        return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str):
+        if key in self._local:
+            self._local.move_to_end(key)
+            return self._local[key]
+
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(f"{self.namespace}:{key}")
+            except Exception as e:
+                log.error("Redis cache error: %s", e)
+                return None
+            if raw is not None:
+                value = orjson.loads(raw)
+                self._remember(key, value)
+                return value
+
+        return None
+
+    def set(self, key: str, value) -> None:
+        self._remember(key, value)
+        if self._redis is not None:
+            try:
+                self._redis.set(f"{self.namespace}:{key}", orjson.dumps(value), ex=self.ttl)
+            except Exception as e:
+                log.error("Redis cache error: %s", e)
+
+    def _remember(self, key: str, value) -> None:
+        self._local[key] = value
+        self._local.move_to_end(key)
+        if len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+class SessionHistory:
+    """Bounded session history, shared through Redis when it's configured.
+
+    Redis holds the sliding window (RPUSH + LTRIM) and is re-read on every
+    ``messages()`` call, so workers serving the same session see each other's
+    turns. The local deque mirrors it and is used when Redis is unset or
+    unreachable.
+    """
+
+    def __init__(self, session_id: str):
+        self._redis = _redis_client
+        self._redis_key = f"history:{session_id}"
+        self._local = deque(maxlen=HISTORY_TURNS)
+
+    def messages(self) -> list:
+        """Snapshot of the current window, oldest first"""
+        if self._redis is not None:
+            try:
+                raws = self._redis.lrange(self._redis_key, -HISTORY_TURNS, -1)
+            except Exception as e:
+                log.error("Redis history error: %s", e)
+            else:
+                self._local = deque(map(orjson.loads, raws), maxlen=HISTORY_TURNS)
+        return list(self._local)
+
+    def append(self, message: dict) -> None:
+        self._local.append(message)
+        if self._redis is None:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.rpush(self._redis_key, orjson.dumps(message))
+            pipe.ltrim(self._redis_key, -HISTORY_TURNS, -1)
+            pipe.expire(self._redis_key, HISTORY_TTL)
+            pipe.execute()
+        except Exception as e:
+            log.error("Redis history error: %s", e)
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a call would have to wait past the limiter's max_wait"""
+
+class RateLimiter:
+    """Sliding-window limiter that spaces calls to fit a provider's per-minute quota.
+
+    Calls that fit the window go straight through; the rest wait for the next
+    free slot, or raise RateLimitExceeded if that is more than ``max_wait``
+    away so the caller can fall back instead of collecting a 429.
+    """
+
+    def __init__(self, name: str, per_minute: int, max_wait: float = RATE_LIMIT_MAX_WAIT):
+        self.name = name
+        self.per_minute = per_minute
+        self.max_wait = max_wait
+        self._starts = deque()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserve the next free slot and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            while self._starts and self._starts[0] <= now - 60:
+                self._starts.popleft()
+
+            start = now
+            if len(self._starts) >= self.per_minute:
+                start = max(now, self._starts[-self.per_minute] + 60)
+            if start - now > self.max_wait:
+                raise RateLimitExceeded(f"{self.name} rate limit of {self.per_minute}/min reached")
+
+            self._starts.append(start)
+            return start - now
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
 class VoiceAgentAPI:
     """API wrapper for voice agent functionality"""
 
     def __init__(self):
         self.murf_api_key = os.getenv('MURF_API_KEY')
-        self.deepgram_api_key = os.getenv('DEEPGRAM_API_KEY')
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
 
-        # Initialize Gemini client
-        if self.gemini_api_key:
-            try:
-                self.gemini_client = genai.Client(api_key=self.gemini_api_key)
-            except Exception as e:
-                print(f"Gemini client initialization failed: {e}")
-                self.gemini_client = None
-        else:
-            self.gemini_client = None
-
-        # Initialize Deepgram (skip for now due to compatibility issues)
-        self.deepgram_client = None
-        # if self.deepgram_api_key:
-        #     try:
-        #         self.deepgram_client = DeepgramClient(self.deepgram_api_key)
-        #     except Exception as e:
-        #         print(f"Deepgram initialization failed: {e}")
-        #         self.deepgram_client = None
-
-    def generate_response(self, user_input: str, conversation_history: list) -> str:
-        """Generate AI response using Gemini with proper prompt engineering"""
-        if not self.gemini_client:
-            return self._fallback_response(user_input, conversation_history)
+        self.http = _murf_http
+        self._murf_headers = {
+            'api-key': self.murf_api_key or '',
+            'Content-Type': 'application/json',
+        }
+        self._murf_payload_template = {
+            'voiceId': MURF_VOICE_ID,
+            'format': MURF_FORMAT,
+            'sampleRate': MURF_SAMPLE_RATE,
+        }
+
+        # Cached Gemini replies and Murf audio URLs, keyed on a hash of their inputs
+        self._llm_cache = ResponseCache('gemini')
+        self._tts_cache = ResponseCache('murf')
+
+        # Keep traffic under the provider quotas instead of retrying 429s
+        self._gemini_limiter = RateLimiter('Gemini', GEMINI_RPM)
+        self._murf_limiter = RateLimiter('Murf', MURF_RPM)
+
+        # Worker pool for Murf calls pipelined behind Gemini streaming
+        self._tts_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='murf-tts')
+
+    @cached_property
+    def gemini_client(self):
+        """Gemini client, built on first use; raises if it can't be created"""
+        if not self.gemini_api_key:
+            raise RuntimeError('GEMINI_API_KEY missing')
+        # Imported here so fallback-only workers never load the SDK
+        import google.genai as genai
+        return genai.Client(api_key=self.gemini_api_key)
+
+    def _build_prompt(self, user_input: str, conversation_history: list) -> str:
+        """Build the per-turn Gemini prompt from recent history (the persona is in GEMINI_CONFIG)"""
+        # Build conversation context from the last 6 messages
+        parts = []
+        append = parts.append
+        for msg in list(conversation_history or ())[-6:]:
+            prefix = ROLE_PREFIXES.get(msg.get('role', 'user'))
+            if prefix is None:
+                continue
+            msg_parts = msg.get('parts')
+            append(prefix)
+            append(msg_parts[0] if msg_parts else '')
+            append("\n")
+        conversation_context = "".join(parts)
+
+        return f"{conversation_context}User: {user_input}\nAssistant:"
+
+    @staticmethod
+    def _normalize_utterance(text: str) -> str:
+        """Casefold, collapse whitespace and drop trailing ?!. so near-identical turns share a key"""
+        return UTTERANCE_END_RE.sub("", " ".join((text or "").casefold().split()))
+
+    def _llm_cache_key(self, user_input: str, conversation_history: list) -> str:
+        """Response cache key over the same 6-message window the prompt uses"""
+        normalize = self._normalize_utterance
+        recent = []
+        for msg in list(conversation_history or ())[-6:]:
+            msg_parts = msg.get('parts')
+            recent.append(msg.get('role', 'user'))
+            recent.append(normalize(msg_parts[0] if msg_parts else ''))
+        return ResponseCache.key(*GEMINI_CACHE_SCOPE, *recent, normalize(user_input))
+
+    def generate_response_stream(self, user_input: str, conversation_history: list):
+        """Stream the AI response from Gemini as text chunks"""
+        if not self.gemini_api_key:
+            yield self._fallback_response(user_input, conversation_history)
+            return
 
+        produced = []
+        held = ""
         try:
-            # Create a system prompt for the AI assistant
-            system_prompt = """You are Neha, a helpful and friendly AI voice assistant living in India for a hackathon project.
-            You should:
-            - Be warm, conversational, and culturally aware of Indian context.
-            - Use Indian English expressions and be familiar with Indian culture, festivals, and daily life.
-            - Be enthusiastic about Indian tech innovation, startups, and cultural diversity.
-            - If asked to tell a story or be creative, you should provide a longer, more detailed response.
-            - For normal questions, keep responses reasonably concise for a voice interface.
-            - Show a friendly, approachable personality with Indian warmth.
-            - Remember context from the conversation to avoid repetition.
-            - Be enthusiastic about helping users with their Indian lifestyle and tech needs.
-
-            You live in India and understand Indian culture, so you can reference Indian festivals, food, cities, and daily life naturally.
-            This is for a voice interface, so responses should sound natural when spoken in an Indian accent."""
-
-            # Build conversation context from history
-            conversation_context = ""
-            if conversation_history:
-                # Add recent conversation history for context
-                recent_history = conversation_history[-6:]  # Last 6 messages for context
-                for msg in recent_history:
-                    role = msg.get('role', 'user')
-                    content = msg.get('parts', [''])[0] if msg.get('parts') else ''
-                    if role == 'user':
-                        conversation_context += f"User: {content}\n"
-                    elif role == 'model':
-                        conversation_context += f"Assistant: {content}\n"
-
-            # Create the full prompt
-            full_prompt = f"{system_prompt}\n\n{conversation_context}User: {user_input}\nAssistant:"
-
-            # Generate response using the new API format
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=full_prompt
-            )
-
-            ai_response = response.text.strip()
-
-            # Ensure response isn't empty and is reasonable length
-            if not ai_response or len(ai_response) < 5:
-                return self._fallback_response(user_input, conversation_history)
-
-            return ai_response
+            full_prompt = self._build_prompt(user_input, conversation_history)
+
+            cache_key = self._llm_cache_key(user_input, conversation_history)
+            cached = self._llm_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+            self._gemini_limiter.acquire()
+            for chunk in self.gemini_client.models.generate_content_stream(
+                model=GEMINI_MODEL,
+                contents=full_prompt,
+                config=GEMINI_CONFIG
+            ):
+                if not chunk.text:
+                    continue
+                produced.append(chunk.text)
+                # Hold the opening text back until it's clearly more than a throwaway reply
+                if held is not None:
+                    held += chunk.text
+                    if len(held.strip()) < MIN_REPLY_CHARS:
+                        continue
+                    text, held = held, None
+                else:
+                    text = chunk.text
+                yield text
+
+            ai_response = "".join(produced).strip()
+            if len(ai_response) >= MIN_REPLY_CHARS:
+                self._llm_cache.set(cache_key, ai_response)
 
         except Exception as e:
-            print(f"Gemini API error: {e}")
-            return self._fallback_response(user_input, conversation_history)
+            log.error("Gemini API error: %s", e)
+
+        # Nothing usable came back before the stream ended or failed
+        if held is not None:
+            yield self._fallback_response(user_input, conversation_history)
+
+    def generate_and_speak(self, user_input: str, conversation_history: list):
+        """Pipeline Gemini streaming into per-sentence Murf synthesis.
+
+        Each sentence is sent to Murf as soon as Gemini finishes it, so TTS
+        overlaps the rest of the generation. Yields ``{'index', 'text',
+        'speech'}`` dicts in sentence order and returns the full reply text,
+        with Gemini's own line breaks, once exhausted.
+        """
+        pending = deque()
+        produced = []
+        buffer = ""
+        marker = ""
+        index = 0
+
+        def dispatch(sentence):
+            nonlocal index
+            pending.append((index, sentence, self._tts_pool.submit(self.speak_with_murf, sentence)))
+            index += 1
+
+        def submit(sentence):
+            nonlocal marker
+            sentence = sentence.strip()
+            next_marker = ""
+            found = LIST_MARKER_RE.search(sentence)
+            if found:
+                sentence, next_marker = sentence[:found.start()].strip(), found.group(1)
+            if sentence:
+                dispatch(f"{marker} {sentence}" if marker else sentence)
+                marker = ""
+            if next_marker:
+                marker = next_marker
+
+        def ready(block=False):
+            while pending and (block or pending[0][2].done()):
+                i, sentence, future = pending.popleft()
+                yield {'index': i, 'text': sentence, 'speech': future.result()}
+
+        for chunk in self.generate_response_stream(user_input, conversation_history):
+            produced.append(chunk)
+            buffer += chunk
+            *sentences, buffer = SENTENCE_END_RE.split(buffer)
+            for sentence in sentences:
+                submit(sentence)
+            yield from ready()
+
+        # A list marker with nothing after it is dropped
+        submit(buffer)
+        yield from ready(block=True)
+        return "".join(produced).strip()
+
+    def generate_responses_batch(self, turns: list) -> list:
+        """Answer many ``(user_input, conversation_history)`` turns in one Gemini batch job.
+
+        Polls the job with exponential backoff until it finishes or
+        GEMINI_BATCH_TIMEOUT elapses. Returns replies in turn order, using the
+        fallback for any turn the batch could not answer.
+        """
+        if not self.gemini_api_key:
+            return [self._fallback_response(user_input, history) for user_input, history in turns]
+
+        prompts = cpu_pool.apply(
+            lambda: [self._build_prompt(user_input, history) for user_input, history in turns]
+        )
+
+        self._gemini_limiter.acquire()
+        job = self.gemini_client.batches.create(
+            model=GEMINI_MODEL,
+            src=[
+                {'contents': [{'role': 'user', 'parts': [{'text': prompt}]}], 'config': GEMINI_CONFIG}
+                for prompt in prompts
+            ],
+            config={'display_name': f"voice-agent-{uuid.uuid4().hex[:8]}"}
+        )
+
+        delay = 2.0
+        deadline = time.monotonic() + GEMINI_BATCH_TIMEOUT
+        while job.state.name not in BATCH_DONE_STATES:
+            if time.monotonic() >= deadline:
+                # Nobody is waiting for the results any more; stop the job from running and billing
+                try:
+                    self.gemini_client.batches.cancel(name=job.name)
+                except Exception as e:
+                    log.error("Gemini batch cancel failed: %s", e)
+                raise TimeoutError(f"Gemini batch {job.name} still {job.state.name}")
+            time.sleep(delay)
+            delay = min(delay * 2, 60.0)
+            job = self.gemini_client.batches.get(name=job.name)
+
+        if job.state.name != 'JOB_STATE_SUCCEEDED':
+            raise RuntimeError(f"Gemini batch {job.name} ended in {job.state.name}")
+
+        responses = (job.dest.inlined_responses if job.dest else None) or []
+        replies = []
+        for i, (user_input, history) in enumerate(turns):
+            item = responses[i] if i < len(responses) else None
+            text = item.response.text if item and item.response and not item.error else None
+            if text and len(text.strip()) >= 5:
+                replies.append(text.strip())
+            else:
+                replies.append(self._fallback_response(user_input, history))
+        return replies
 
     def _fallback_response(self, user_input: str, conversation_history: list = None) -> str:
         """Smart fallback responses with conversation context"""
-        user_input_lower = user_input.lower()
-
-        # Check for specific keywords and patterns
-        if any(word in user_input_lower for word in ["hello", "hi", "hey"]):
-            return "Namaste! I'm Neha, your AI voice assistant in India. How can I help you today?"
-
-        if "how are you" in user_input_lower:
-            return "I'm doing great, thank you! It's wonderful to connect with you from India. What's on your mind?"
-
-        if any(word in user_input_lower for word in ["name", "who are you"]):
-            return "I'm Neha, your friendly AI voice assistant built for the Techfest IIT Bombay hackathon using Murf Falcon TTS!"
-
-        if any(word in user_input_lower for word in ["help", "what can you do"]):
-            return "I can have natural conversations with you! I understand Indian culture and use Google's Gemini AI for smart responses with Murf Falcon voice synthesis."
-
-        if any(word in user_input_lower for word in ["thank", "thanks"]):
-            return "You're most welcome! Dhanyavaad! I'm here whenever you need to chat."
-
-        if any(word in user_input_lower for word in ["bye", "goodbye", "see you"]):
-            return "Goodbye! It was wonderful talking with you. Dhanyavaad and take care!"
+        # Check for specific keywords and patterns in a single regex pass
+        intent_reply = _match_intent(user_input)
+        if intent_reply is not None:
+            return intent_reply
 
         # Check conversation history for context
         if conversation_history and len(conversation_history) > 0:
-            # Look for repeated questions or patterns
-            recent_messages = [msg.get('parts', [''])[0] for msg in conversation_history[-4:] if msg.get('role') == 'user']
+            # Look for repeated questions or patterns in the last 4 messages, without copying the history
+            recent_messages = [msg.get('parts', [''])[0] for msg in islice(reversed(conversation_history), 4) if msg.get('role') == 'user']
             if len(set(recent_messages)) == 1 and len(recent_messages) > 1:
-                return "I see you're asking the same question. Let me try a different approach - could you tell me more about what you're looking for?"
+                return REPEAT_REPLY
 
         # Default engaging responses based on input type
         if "?" in user_input:
-            return f"That's a great question about '{user_input}'. While I'm still learning, I'd love to hear your thoughts on it!"
+            return QUESTION_TEMPLATE.format(user_input)
 
         if len(user_input.split()) > 10:
-            return "That sounds interesting! You have a lot to say about that topic. Tell me more!"
-
-        # Fun, engaging default responses
-        default_responses = [
-            f"I heard you say '{user_input}'. That's fascinating! What made you think about that?",
-            f"'{user_input}' - I love hearing about that! Can you tell me more?",
-            f"Thanks for sharing that with me! '{user_input}' sounds really interesting.",
-            f"I appreciate you telling me about '{user_input}'. What's your favorite part?",
-            f"That's really cool! '{user_input}' got me thinking. What's next on your mind?"
-        ]
+            return LONG_INPUT_REPLY
 
         # Use input length to select response variety
-        response_index = len(user_input) % len(default_responses)
-        return default_responses[response_index]
+        return DEFAULT_TEMPLATES[len(user_input) % len(DEFAULT_TEMPLATES)].format(user_input)
+
+    def _tts_cache_key(self, text: str) -> str:
+        """Cache key covering everything that changes the synthesized audio"""
+        template = self._murf_payload_template
+        return ResponseCache.key(template['voiceId'], template['format'], str(template['sampleRate']), text)
 
     def speak_with_murf(self, text: str) -> dict:
-        """Generate speech using Murf API"""
-        try:
-            headers = {
-                'api-key': self.murf_api_key,
-                'Content-Type': 'application/json',
-            }
+        """Generate speech using Murf API, serving repeated text from the cache"""
+        cache_key = self._tts_cache_key(text)
+        cached = self._tts_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._synthesize_with_murf(text)
+        if result.get('success'):
+            self._tts_cache.set(cache_key, result)
+        return result
+
+    @staticmethod
+    def _parse_murf_response(body: bytes, text: str) -> dict:
+        """Turn a Murf generate response body into a speech result dict"""
+        # Cheap byte scan before parsing; only audioFile is used
+        if b'"audioFile"' not in body:
+            return {'success': False, 'error': 'No audio URL in response'}
 
-            payload = {
-                'voiceId': 'en-US-samantha',
-                'text': text,
-                'format': 'mp3',
-                'sampleRate': 24000,
+        json_response = orjson.loads(body)
+        if 'audioFile' in json_response:
+            return {
+                'success': True,
+                'audio_url': json_response['audioFile'],
+                'text': text
             }
 
-            response = requests.post(
-                'https://api.murf.ai/v1/speech/generate',
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
+        return {'success': False, 'error': 'No audio URL in response'}
 
-            json_response = response.json()
-            if 'audioFile' in json_response:
-                return {
-                    'success': True,
-                    'audio_url': json_response['audioFile'],
-                    'text': text
-                }
+    def _synthesize_with_murf(self, text: str) -> dict:
+        """Call the Murf generate endpoint for one piece of text"""
+        try:
+            body = orjson.dumps({**self._murf_payload_template, 'text': text})
+
+            # Connection errors are retried by the transport; retry gateway errors
+            # and HTTP/2 connections dropped mid-request here
+            for attempt in range(MURF_MAX_RETRIES + 1):
+                self._murf_limiter.acquire()
+                try:
+                    response = self.http.post(MURF_API_URL, headers=self._murf_headers, content=body)
+                except httpx.RemoteProtocolError:
+                    if attempt == MURF_MAX_RETRIES:
+                        raise
+                else:
+                    if response.status_code not in MURF_RETRY_STATUSES or attempt == MURF_MAX_RETRIES:
+                        break
+                # Jitter keeps concurrent sentence requests from retrying in lockstep
+                time.sleep(MURF_RETRY_DELAY * 2 ** attempt + random.uniform(0, MURF_RETRY_DELAY))
+            response.raise_for_status()
 
-            return {'success': False, 'error': 'No audio URL in response'}
+            return self._parse_murf_response(response.content, text)
 
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
+    def open_audio_stream(self, audio_url: str) -> httpx.Response:
+        """Start downloading synthesized audio without buffering the whole file.
+
+        The caller must ``close()`` the returned response.
+        """
+        audio_response = self.http.send(self.http.build_request('GET', audio_url), stream=True)
+        try:
+            audio_response.raise_for_status()
+        except httpx.HTTPStatusError:
+            audio_response.close()
+            raise
+        return audio_response
+
+    def speak_many_with_murf(self, texts: list) -> list:
+        """Synthesize several texts concurrently, in order, on the shared HTTP/2 client"""
+        return list(tts_batch_pool.map(self.speak_with_murf, texts))
+
+    def warm_tts_cache(self) -> None:
+        """Pre-synthesize the static fallback sentences, reusing shelve entries still within the TTL"""
+        sentences = {
+            sentence.strip()
+            for reply in STATIC_REPLIES
+            for sentence in SENTENCE_END_RE.split(reply)
+            if sentence.strip()
+        }
+
+        try:
+            store = shelve.open(TTS_WARM_CACHE_PATH)
+        except Exception as e:
+            # Another worker may hold the file; warm this process in memory only
+            log.warning("TTS warm cache unavailable: %s", e)
+            store = None
+
+        try:
+            now = time.time()
+            for sentence in sentences:
+                key = self._tts_cache_key(sentence)
+                entry = store.get(key) if store is not None else None
+                if entry and now - entry['saved_at'] < self._tts_cache.ttl:
+                    self._tts_cache.set(key, entry['result'])
+                    continue
+
+                result = self.speak_with_murf(sentence)
+                if result.get('success') and store is not None:
+                    store[key] = {'saved_at': now, 'result': result}
+        finally:
+            if store is not None:
+                store.close()
+
+def _validate_config() -> None:
+    """Report missing API keys at startup instead of degrading silently"""
+    missing = [name for name in ('MURF_API_KEY', 'GEMINI_API_KEY') if not os.getenv(name)]
+    for name in missing:
+        log.warning("⚠️  %s is not set", name)
+    if 'GEMINI_API_KEY' in missing:
+        log.warning("⚠️  Gemini is unavailable; replies will use the built-in fallback responses")
+
 # Initialize API
+_validate_config()
 voice_agent = VoiceAgentAPI()
+if voice_agent.murf_api_key:
+    socketio.start_background_task(voice_agent.warm_tts_cache)
+
+def _get_history(session_id: str) -> SessionHistory:
+    """Return the bounded history for a session, evicting the least recently used"""
+    history = conversations.get(session_id)
+    if history is None:
+        history = conversations[session_id] = SessionHistory(session_id)
+        if len(conversations) > MAX_SESSIONS:
+            conversations.popitem(last=False)
+    else:
+        conversations.move_to_end(session_id)
+    return history
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat(timespec='milliseconds')})
+
+def _process_turn(user_message: str, session_id: str, on_part=None) -> dict:
+    """Run one conversation turn shared by the REST and WebSocket transports.
+
+    Streams the reply through ``generate_and_speak``; ``on_part`` is called
+    with each sentence and its audio as soon as it's ready. Returns the
+    complete response dict.
+    """
+    # Get or create conversation history
+    history = _get_history(session_id)
+
+    # Add user message to history
+    history.append({
+        'role': 'user',
+        'parts': [user_message]
+    })
+
+    # One snapshot per turn, so the prompt, cache key and fallback all see the same window
+    parts = []
+    stream = voice_agent.generate_and_speak(user_message, history.messages())
+    while True:
+        try:
+            part = next(stream)
+        except StopIteration as done:
+            # The full reply keeps Gemini's paragraph breaks for the chat text and history
+            ai_response = done.value
+            break
+        parts.append(part)
+        if on_part is not None:
+            on_part(part)
+
+    # Add AI response to history
+    history.append({
+        'role': 'model',
+        'parts': [ai_response]
+    })
+
+    response_data = {
+        'user_message': user_message,
+        'ai_response': ai_response,
+        'speech': {
+            'success': any(part['speech'].get('success') for part in parts),
+            'streamed': on_part is not None,
+            'audio_urls': [part['speech'].get('audio_url') for part in parts]
+        },
+        'timestamp': datetime.now().isoformat(timespec='milliseconds')
+    }
+    # Streamed parts were already delivered one by one
+    if on_part is None:
+        response_data['parts'] = parts
+    return response_data
 
 @app.route('/api/conversation', methods=['POST'])
 def send_message():
@@ -215,36 +830,101 @@ def send_message():
         if not user_message:
             return jsonify({'error': 'No message provided'}), 400
 
-        # Get or create conversation history
-        if session_id not in conversations:
-            conversations[session_id] = []
-
-        # Add user message to history
-        conversations[session_id].append({
-            'role': 'user',
-            'parts': [user_message]
-        })
-
-        # Generate AI response
-        ai_response = voice_agent.generate_response(user_message, conversations[session_id])
-
-        # Add AI response to history
-        conversations[session_id].append({
-            'role': 'model',
-            'parts': [ai_response]
-        })
-
-        # Generate speech for AI response
-        speech_result = voice_agent.speak_with_murf(ai_response)
-
-        response_data = {
-            'user_message': user_message,
-            'ai_response': ai_response,
-            'speech': speech_result,
-            'timestamp': datetime.now().isoformat()
-        }
+        return jsonify(_process_turn(user_message, session_id))
 
-        return jsonify(response_data)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/conversation/batch', methods=['POST'])
+def send_message_batch():
+    """Answer many queued messages through the Gemini Batch API"""
+    if not GEMINI_BATCH_ENABLED:
+        return jsonify({'error': 'Batch mode is disabled'}), 404
+
+    if not voice_agent.gemini_api_key:
+        return jsonify({'error': 'Gemini is not configured'}), 503
+
+    try:
+        data = request.get_json(silent=True) or {}
+        items = data.get('messages', [])
+        if not isinstance(items, list) or not all(
+            isinstance(item, dict) and isinstance(item.get('message', ''), str) for item in items
+        ):
+            return jsonify({'error': 'messages must be a list of {"message": str} objects'}), 400
+
+        if len(items) > MAX_TTS_BATCH:
+            return jsonify({'error': f'At most {MAX_TTS_BATCH} messages per request'}), 400
+
+        messages = [
+            (item.get('message', '').strip(), item.get('session_id', 'default'))
+            for item in items
+        ]
+        messages = [(message, session_id) for message, session_id in messages if message]
+
+        if not messages:
+            return jsonify({'error': 'No messages provided'}), 400
+
+        # Prompt each turn from a snapshot of its history plus the session's earlier
+        # queued messages; histories only change once the batch has succeeded, so a
+        # timed-out or failed batch can be retried without duplicating turns
+        pending = {}
+        turns = []
+        for user_message, session_id in messages:
+            if session_id not in pending:
+                pending[session_id] = _get_history(session_id).messages()
+            pending[session_id].append({
+                'role': 'user',
+                'parts': [user_message]
+            })
+            turns.append((user_message, list(pending[session_id])))
+
+        ai_responses = voice_agent.generate_responses_batch(turns)
+
+        # Add each user message and its AI response to history
+        for (user_message, session_id), ai_response in zip(messages, ai_responses):
+            history = _get_history(session_id)
+            history.append({
+                'role': 'user',
+                'parts': [user_message]
+            })
+            history.append({
+                'role': 'model',
+                'parts': [ai_response]
+            })
+
+        # Synthesize per sentence, like the per-turn path, so the sentence and warm caches hit
+        sentences = [_split_sentences(ai_response) for ai_response in ai_responses]
+        speech_results = iter(voice_agent.speak_many_with_murf(
+            [sentence for reply in sentences for sentence in reply]
+        ))
+
+        timestamp = datetime.now().isoformat(timespec='milliseconds')
+        results = []
+        for (user_message, session_id), ai_response, reply in zip(messages, ai_responses, sentences):
+            parts = [
+                {'index': index, 'text': sentence, 'speech': next(speech_results)}
+                for index, sentence in enumerate(reply)
+            ]
+            results.append({
+                'session_id': session_id,
+                'user_message': user_message,
+                'ai_response': ai_response,
+                'speech': {
+                    'success': any(part['speech'].get('success') for part in parts),
+                    'streamed': False,
+                    'audio_urls': [part['speech'].get('audio_url') for part in parts]
+                },
+                'parts': parts,
+                'timestamp': timestamp
+            })
+
+        return app.response_class(orjson.dumps({'results': results}), mimetype='application/json')
+
+    except RateLimitExceeded as e:
+        return jsonify({'error': str(e)}), 429
+
+    except TimeoutError as e:
+        return jsonify({'error': str(e)}), 504
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -254,6 +934,21 @@ def text_to_speech():
     """Convert text to speech"""
     try:
         data = request.get_json()
+
+        # Batch form: {'texts': [...]} fans out to Murf with bounded concurrency
+        if 'texts' in data:
+            texts = data.get('texts')
+            if not isinstance(texts, list) or not texts:
+                return jsonify({'error': 'No texts provided'}), 400
+            if len(texts) > MAX_TTS_BATCH:
+                return jsonify({'error': f'At most {MAX_TTS_BATCH} texts per request'}), 400
+
+            if not all(isinstance(text, str) and text.strip() for text in texts):
+                return jsonify({'error': 'Every text must be a non-empty string'}), 400
+            texts = [text.strip() for text in texts]
+
+            return jsonify({'results': voice_agent.speak_many_with_murf(texts)})
+
         text = data.get('text', '').strip()
 
         if not text:
@@ -265,16 +960,42 @@ def text_to_speech():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/tts_stream', methods=['GET', 'POST'])
+def text_to_speech_stream():
+    """Convert text to speech and stream the audio back on the same response"""
+    try:
+        data = request.get_json(silent=True) or request.args
+        text = data.get('text', '').strip()
+
+        if not text:
+            return jsonify({'error': 'No text provided'}), 400
+
+        speech_result = voice_agent.speak_with_murf(text)
+        if not speech_result.get('success'):
+            return jsonify(speech_result), 502
+
+        # Proxy the audio so the browser can start decoding without a second round-trip
+        audio_response = voice_agent.open_audio_stream(speech_result['audio_url'])
+        response = Response(
+            stream_with_context(audio_response.iter_bytes(AUDIO_CHUNK_SIZE)),
+            mimetype=audio_response.headers.get('Content-Type', 'audio/mpeg')
+        )
+        response.call_on_close(audio_response.close)
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @socketio.on('connect')
 def handle_connect():
     """Handle WebSocket connection"""
-    print('Client connected')
+    log.info('Client connected')
     emit('status', {'message': 'Connected to voice agent'})
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle WebSocket disconnection"""
-    print('Client disconnected')
+    log.info('Client disconnected')
 
 @socketio.on('send_message')
 def handle_message(data):
@@ -282,46 +1003,54 @@ def handle_message(data):
     try:
         user_message = data.get('message', '').strip()
         session_id = data.get('session_id', 'default')
+        # Echoed on every event of the turn; handlers run concurrently, so turns can interleave
+        turn_id = data.get('turn_id')
 
         if not user_message:
             emit('error', {'message': 'No message provided'})
             return
 
-        # Get or create conversation history
-        if session_id not in conversations:
-            conversations[session_id] = []
+        # Emit each sentence with its audio as soon as it's ready, then the full response
+        response_data = _process_turn(
+            user_message, session_id,
+            on_part=lambda part: emit('partial_response', {**part, 'turn_id': turn_id})
+        )
+        response_data['turn_id'] = turn_id
+        emit('message_response', response_data)
 
-        # Add user message to history
-        conversations[session_id].append({
-            'role': 'user',
-            'parts': [user_message]
-        })
+    except Exception as e:
+        emit('error', {'message': str(e)})
+
+@socketio.on('tts_stream')
+def handle_tts_stream(data):
+    """Stream synthesized audio to the client as binary WebSocket frames"""
+    try:
+        text = data.get('text', '').strip()
 
-        # Generate AI response
-        ai_response = voice_agent.generate_response(user_message, conversations[session_id])
+        if not text:
+            emit('error', {'message': 'No text provided'})
+            return
 
-        # Add AI response to history
-        conversations[session_id].append({
-            'role': 'model',
-            'parts': [ai_response]
-        })
+        speech_result = voice_agent.speak_with_murf(text)
+        if not speech_result.get('success'):
+            emit('error', {'message': speech_result.get('error', 'Speech generation failed')})
+            return
 
-        # Generate speech for AI response
-        speech_result = voice_agent.speak_with_murf(ai_response)
+        audio_response = voice_agent.open_audio_stream(speech_result['audio_url'])
+        try:
+            for index, chunk in enumerate(audio_response.iter_bytes(AUDIO_CHUNK_SIZE)):
+                emit('audio_chunk', {'index': index, 'data': chunk})
+        finally:
+            audio_response.close()
 
-        # Send response back to client
-        emit('message_response', {
-            'user_message': user_message,
-            'ai_response': ai_response,
-            'speech': speech_result,
-            'timestamp': datetime.now().isoformat()
-        })
+        emit('audio_end', {'text': text})
 
     except Exception as e:
         emit('error', {'message': str(e)})
 
 if __name__ == '__main__':
-    print("🚀 Starting Murf AI Voice Agent Backend...")
-    print("📡 Flask server running on http://localhost:5000")
-    print("🔌 WebSocket support enabled")
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
+    log.info("🚀 Starting Murf AI Voice Agent Backend...")
+    log.info("📡 Flask server running on http://localhost:5000")
+    log.info("🔌 WebSocket support enabled (gevent)")
+    # debug=False: the Werkzeug reloader/debugger don't work under gevent
+    socketio.run(app, host='0.0.0.0', port=5000, debug=False)
@@ -18,6 +18,9 @@ function App() {
   const messagesEndRef = useRef(null);
   const recognitionRef = useRef(null);
   const audioContextRef = useRef(null);
+  const audioQueueRef = useRef(Promise.resolve());
+  const queuePlayerRef = useRef(null);
+  const audioStateRef = useRef({});
 
 
 
@@ -51,30 +54,29 @@ function App() {
             setIsRecording(false);
             console.log('Voice recognition result:', transcript);
 
-            // Auto-send the message after a short delay
-            setTimeout(() => {
-              if (transcript.trim()) {
-                setIsTyping(true);
-
-                // Add user message immediately
-                const userMessage = {
-                  id: Date.now(),
-                  type: 'user',
-                  content: transcript.trim(),
-                  timestamp: new Date().toISOString()
-                };
-                setMessages(prev => [...prev, userMessage]);
-
-                // Send via WebSocket
-                socket.emit('send_message', {
-                  message: transcript.trim(),
-                  session_id: sessionId
-                });
-
-                // Clear input after sending
-                setInputMessage('');
-              }
-            }, 500); // Small delay to show the transcript briefly
+            // Send the final transcript right away so the reply starts streaming sooner
+            if (transcript.trim()) {
+              setIsTyping(true);
+
+              // Add user message immediately
+              const userMessage = {
+                id: Date.now(),
+                type: 'user',
+                content: transcript.trim(),
+                timestamp: new Date().toISOString()
+              };
+              setMessages(prev => [...prev, userMessage]);
+
+              // Send via WebSocket
+              socket.emit('send_message', {
+                message: transcript.trim(),
+                session_id: sessionId,
+                turn_id: newTurnId()
+              });
+
+              // Clear input after sending
+              setInputMessage('');
+            }
           };
 
           recognitionRef.current.onerror = (event) => {
@@ -112,20 +114,32 @@ function App() {
       console.log('Disconnected from server');
     });
 
+    // Streamed sentences arrive before the full response; play them back in order
+    // The server echoes our turn_id, which becomes the AI message's id
+    socket.on('partial_response', (data) => {
+      if (data.speech && data.speech.success && data.speech.audio_url) {
+        queueAudio(data.speech.audio_url, data.turn_id);
+      }
+    });
+
     socket.on('message_response', (data) => {
       setIsTyping(false);
-      const messageId = Date.now();
+      const messageId = data.turn_id || Date.now();
       const aiMessage = {
         id: messageId,
         ai: data.ai_response,
         speech: data.speech,
-        timestamp: data.timestamp
+        timestamp: data.timestamp,
+        ...audioStateRef.current[messageId]
       };
       setMessages(prev => [...prev, aiMessage]);
 
-      // Auto-play audio if available
-      if (data.speech && data.speech.success && data.speech.audio_url) {
-        playAudio(data.speech.audio_url, messageId);
+      if (data.speech && data.speech.success) {
+        // Streamed sentences were already queued as they arrived
+        if (!data.speech.streamed) {
+          (data.speech.audio_urls || []).filter(Boolean).forEach(url => queueAudio(url, messageId));
+        }
+        finishQueuedAudio(messageId);
       }
     });
 
@@ -137,6 +151,7 @@ function App() {
     return () => {
       socket.off('connect');
       socket.off('disconnect');
+      socket.off('partial_response');
       socket.off('message_response');
       socket.off('error');
       if (recognitionRef.current) {
@@ -164,77 +179,64 @@ function App() {
     }
   };
 
-  const playAudio = async (audioUrl, messageId) => {
-    try {
-      // Enable audio context first
-      await enableAudio();
+  // Distinct from the Date.now() ids of user messages sent in the same millisecond
+  const newTurnId = () => `turn-${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
 
-      const audio = new Audio(audioUrl);
-      audio.volume = 0.8; // Set volume to 80%
+  // Merge audio flags into a message. They're also kept in a ref because streamed
+  // sentences can start playing before message_response adds the message.
+  const setAudioState = (messageId, state) => {
+    audioStateRef.current[messageId] = { ...audioStateRef.current[messageId], ...state };
+    setMessages(prev => prev.map(msg =>
+      msg.id === messageId ? { ...msg, ...state } : msg
+    ));
+  };
 
-      // Add event listeners
-      audio.onplay = () => {
-        console.log('Audio started playing');
-        // Update message to show audio is playing
-        setMessages(prev => prev.map(msg =>
-          msg.id === messageId ? { ...msg, audioPlaying: true } : msg
-        ));
-      };
+  const queueAudio = (audioUrl, messageId) => {
+    audioQueueRef.current = audioQueueRef.current.then(() => playAudioQueued(audioUrl, messageId));
+  };
 
-      audio.onended = () => {
-        console.log('Audio finished playing');
-        // Update message to show audio finished
-        setMessages(prev => prev.map(msg =>
-          msg.id === messageId ? { ...msg, audioPlaying: false, audioPlayed: true } : msg
-        ));
-      };
+  // Runs after the message's last queued sentence: mark it played unless playback failed
+  const finishQueuedAudio = (messageId) => {
+    audioQueueRef.current = audioQueueRef.current.then(() => {
+      const state = audioStateRef.current[messageId] || {};
+      delete audioStateRef.current[messageId];
+      const played = !state.audioBlocked && !state.audioError;
+      setMessages(prev => prev.map(msg =>
+        msg.id === messageId ? { ...msg, audioPlaying: false, audioPlayed: played } : msg
+      ));
+    });
+  };
 
+  const playAudioQueued = (audioUrl, messageId) => {
+    return new Promise((resolve) => {
+      // Reuse one element for every streamed sentence instead of creating a player per clip
+      if (!queuePlayerRef.current) {
+        queuePlayerRef.current = new Audio();
+        queuePlayerRef.current.volume = 0.8;
+      }
+      const audio = queuePlayerRef.current;
+      audio.src = audioUrl;
+      audio.onplay = () => setAudioState(messageId, { audioPlaying: true });
+      audio.onended = resolve;
       audio.onerror = (error) => {
         console.error('Audio playback error:', error);
-        // Mark as failed to play
-        setMessages(prev => prev.map(msg =>
-          msg.id === messageId ? { ...msg, audioError: true } : msg
-        ));
+        setAudioState(messageId, { audioPlaying: false, audioError: true });
+        resolve();
       };
-
-      // Try to play the audio
-      const playPromise = audio.play();
-
-      if (playPromise !== undefined) {
-        playPromise
-          .then(() => {
-            console.log('Audio started playing successfully');
-          })
-          .catch(error => {
-            console.warn('Audio playback blocked:', error);
-            // Mark as blocked - user can click to play manually
-            setMessages(prev => prev.map(msg =>
-              msg.id === messageId ? { ...msg, audioBlocked: true } : msg
-            ));
-          });
-      }
-    } catch (error) {
-      console.error('Error creating audio:', error);
-    }
+      audio.play().catch(error => {
+        console.warn('Audio playback blocked:', error);
+        // Mark as blocked - user can click to play manually
+        setAudioState(messageId, { audioPlaying: false, audioBlocked: true });
+        resolve();
+      });
+    });
   };
 
-  const playAudioManually = (audioUrl, messageId) => {
-    const audio = new Audio(audioUrl);
-    audio.volume = 0.8;
-
-    audio.onplay = () => {
-      setMessages(prev => prev.map(msg =>
-        msg.id === messageId ? { ...msg, audioPlaying: true, audioBlocked: false } : msg
-      ));
-    };
-
-    audio.onended = () => {
-      setMessages(prev => prev.map(msg =>
-        msg.id === messageId ? { ...msg, audioPlaying: false, audioPlayed: true } : msg
-      ));
-    };
-
-    audio.play().catch(console.error);
+  const playAudioManually = (audioUrls, messageId) => {
+    // Replay every sentence of the reply in order through the shared queue
+    setAudioState(messageId, { audioBlocked: false, audioError: false });
+    (audioUrls || []).filter(Boolean).forEach(url => queueAudio(url, messageId));
+    finishQueuedAudio(messageId);
   };
 
   const sendMessage = async (e) => {
@@ -262,7 +264,8 @@ function App() {
     // Send via WebSocket
     socket.emit('send_message', {
       message: message,
-      session_id: sessionId
+      session_id: sessionId,
+      turn_id: newTurnId()
     });
   };
 
@@ -378,7 +381,7 @@ function App() {
                           ) : msg.audioBlocked ? (
                             <button
                               className="play-audio-button"
-                              onClick={() => playAudioManually(msg.speech.audio_url, msg.id)}
+                              onClick={() => playAudioManually(msg.speech.audio_urls, msg.id)}
                               title="Click to play audio"
                             >
                               <span className="audio-icon">🔊</span>
@@ -1,15 +1,17 @@
+import orjson
 import requests
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+session = requests.Session()
+session.headers["api-key"] = os.getenv('MURF_API_KEY')
+
 # List voices (GET /v1/speech/voices)
-response = requests.get(
+response = session.get(
   "https://api.murf.ai/v1/speech/voices",
-  headers={
-    "api-key": os.getenv('MURF_API_KEY')
-  },
+  timeout=(3.05, 27),
 )
 
-print(response.json())
+print(orjson.loads(response.content))
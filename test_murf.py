@@ -4,6 +4,7 @@ Test script for Murf API
 """
 
 import os
+import orjson
 import requests
 from dotenv import load_dotenv
 
@@ -17,6 +18,9 @@ headers = {
     'Content-Type': 'application/json',
 }
 
+# One session so the audio download reuses the connection pool
+session = requests.Session()
+
 payload = {
     'voiceId': 'en-US-terrell',
     'text': 'Hello world, its a mee mario',
@@ -29,7 +33,7 @@ print(f"API Key: {MURF_API_KEY[:10]}...")
 print(f"Payload: {payload}")
 
 try:
-    response = requests.post(
+    response = session.post(
         MURF_API_URL,
         headers=headers,
         json=payload,
@@ -45,22 +49,24 @@ try:
         print(f"Raw response: {response.text[:200]}...")
 
         try:
-            json_response = response.json()
+            json_response = orjson.loads(response.content)
             print(f"JSON response: {json_response}")
 
             if 'audioFile' in json_response:
                 audio_url = json_response['audioFile']
                 print(f"Audio URL: {audio_url}")
 
-                # Download the actual audio file
-                audio_response = requests.get(audio_url)
-                if audio_response.status_code == 200:
-                    with open('test_audio.wav', 'wb') as f:
-                        f.write(audio_response.content)
+                # Download the actual audio file in chunks rather than buffering it whole
+                with session.get(audio_url, timeout=30, stream=True) as audio_response:
+                    if audio_response.status_code == 200:
+                        header = b''
+                        with open('test_audio.wav', 'wb') as f:
+                            for chunk in audio_response.iter_content(65536):
+                                if not header:
+                                    header = chunk[:12]
+                                f.write(chunk)
 
-                    # Check file header
-                    with open('test_audio.wav', 'rb') as f:
-                        header = f.read(12)
+                        # Check the header from the first chunk instead of re-reading the file
                         print(f"File header: {header}")
                         if header.startswith(b'RIFF'):
                             print("✅ This is a WAV file")
@@ -68,8 +74,8 @@ try:
                             print("⚠️ This is an MP3 file")
                         else:
                             print("❓ Unknown format")
-                else:
-                    print(f"Failed to download audio: {audio_response.status_code}")
+                    else:
+                        print(f"Failed to download audio: {audio_response.status_code}")
             else:
                 print("No audioFile in response")
         except Exception as e: